@@ -6,9 +6,11 @@ from research_canvas.telegram.telegram_monitor import TelegramMonitor
 
 load_dotenv()
 
-from fastapi import FastAPI, HTTPException, Depends
-from fastapi.responses import JSONResponse
-from pydantic import BaseModel
+from fastapi import FastAPI, HTTPException, Depends, Request, Response
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import JSONResponse, ORJSONResponse, StreamingResponse
+from pydantic import BaseModel, TypeAdapter, ValidationError, field_validator
+import orjson
 import uvicorn
 from copilotkit.integrations.fastapi import add_fastapi_endpoint
 from copilotkit import CopilotKitSDK, LangGraphAgent
@@ -18,10 +20,15 @@ from telethon.sessions import StringSession
 from contextlib import asynccontextmanager
 import logging
 from google.cloud import bigquery
-from typing import List
+from typing import AsyncIterator, List, Type, TypeVar
 import json
 from datetime import datetime, timedelta
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi_cache import FastAPICache
+from fastapi_cache.backends.inmemory import InMemoryBackend
+from fastapi_cache.backends.redis import RedisBackend
+from fastapi_cache.decorator import cache
+import redis.asyncio as redis
 
 # Import the TelegramAuthManager
 from .telegram.auth_manager import TelegramAuthManager
@@ -51,6 +58,30 @@ class AuthResponse(BaseModel):
     message: str
 
 
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+
+async def parse_body(request: Request, model: Type[ModelT]) -> ModelT:
+    """Parse and validate a JSON request body in one pass with Pydantic."""
+    try:
+        return model.model_validate_json(await request.body())
+    except ValidationError as e:
+        # Match FastAPI's own body errors, whose locations start with "body"
+        raise RequestValidationError(
+            [{**error, "loc": ("body", *error["loc"])} for error in e.errors()]
+        )
+
+
+def json_body_schema(model: Type[BaseModel]) -> dict:
+    """OpenAPI request body for routes that read their body with parse_body."""
+    return {
+        "requestBody": {
+            "content": {"application/json": {"schema": model.model_json_schema()}},
+            "required": True,
+        }
+    }
+
+
 # Global state manager for telegram client
 telegram_manager: Optional[TelegramAuthManager] = None
 
@@ -73,20 +104,112 @@ class ChannelMessage(BaseModel):
         from_attributes = True
         json_encoders = {datetime: lambda v: v.isoformat()}
 
+    @field_validator("initial_scores", mode="before")
+    @classmethod
+    def parse_initial_scores(cls, value):
+        # BigQuery stores the scores as a JSON string
+        if isinstance(value, (str, bytes)):
+            return orjson.loads(value)
+        return value
+
 
 class MessageResponse(BaseModel):
     messages: List[ChannelMessage]
 
 
+# Validates a BigQuery row and emits its JSON in a single pass
+_MSG_ADAPTER = TypeAdapter(ChannelMessage)
+
+
 # Add this to your global state
 telegram_monitor = None
 
+# Response cache namespaces
+MESSAGES_CACHE_NAMESPACE = "tg-msgs"
+STATUS_CACHE_NAMESPACE = "tg-status"
+
+# Streamed message listings larger than this are not cached
+MESSAGES_CACHE_MAX_BYTES = 1024 * 1024
+
+
+def messages_cache_key(hours: int) -> str:
+    """Cache /telegram/messages responses per requested time window."""
+    return f"{FastAPICache.get_prefix()}:{MESSAGES_CACHE_NAMESPACE}:hours={hours}"
+
+
+def status_key_builder(
+    func, namespace: str = "", *, request=None, response=None, args=(), kwargs=None
+) -> str:
+    """Cache /telegram/status responses under a single key."""
+    # Kept below the namespace so FastAPICache.clear(namespace=...) matches it
+    return f"{namespace}:status"
+
+
+async def prepend_item(
+    first: Optional[bytes], rest: AsyncIterator[bytes]
+) -> AsyncIterator[bytes]:
+    """Yield an item already taken from an iterator, then the remaining items."""
+    if first is None:
+        return
+    yield first
+    async for item in rest:
+        yield item
+
+
+async def stream_json_array(
+    items: AsyncIterator[bytes], key: str
+) -> AsyncIterator[bytes]:
+    """Emit serialized items as a JSON array wrapped in a single-key object."""
+    yield b'{"' + key.encode() + b'":['
+    first = True
+    async for item in items:
+        yield item if first else b"," + item
+        first = False
+    yield b"]}"
+
+
+async def cache_stream(
+    chunks: AsyncIterator[bytes], cache_key: str
+) -> AsyncIterator[bytes]:
+    """
+    Pass chunks through, caching the full body if it stays small enough.
+
+    A source error propagates out of the loop, so only bodies from streams
+    that finished cleanly are cached.
+    """
+    body: Optional[List[bytes]] = []
+    size = 0
+    async for chunk in chunks:
+        yield chunk
+        if body is not None:
+            body.append(chunk)
+            size += len(chunk)
+            if size > MESSAGES_CACHE_MAX_BYTES:
+                body = None
+
+    if body is not None:
+        await FastAPICache.get_backend().set(cache_key, b"".join(body), expire=30)
+
+
+async def invalidate_messages_cache():
+    """Drop cached message listings after new rows reach BigQuery."""
+    await FastAPICache.clear(namespace=MESSAGES_CACHE_NAMESPACE)
+
 
 # Update your lifespan function
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     global telegram_manager, telegram_monitor
 
+    # Initialize response cache, falling back to in-process storage without Redis
+    redis_url = os.getenv("REDIS_URL")
+    if redis_url:
+        backend = RedisBackend(redis.from_url(redis_url))
+    else:
+        logger.warning("REDIS_URL not set, using in-memory response cache")
+        backend = InMemoryBackend()
+    FastAPICache.init(backend, prefix="veriver")
+
     # Initialize TelegramAuthManager
     telegram_manager = TelegramAuthManager()
     try:
@@ -101,7 +224,9 @@ async def lifespan(app: FastAPI):
                     telegram_manager.client,
                     project_id,
                     openai_api_key=os.getenv("OPENAI_API_KEY"),
+                    on_flush=invalidate_messages_cache,
                 )
+                await telegram_monitor.ensure_bigquery_resources()
             else:
                 logger.warning("GOOGLE_CLOUD_PROJECT environment variable not set")
     except Exception as e:
@@ -110,11 +235,13 @@ async def lifespan(app: FastAPI):
     yield
 
     # Cleanup
+    if telegram_monitor:
+        await telegram_monitor.close()
     if telegram_manager:
         await telegram_manager.close()
 
 
-app = FastAPI(lifespan=lifespan)
+app = FastAPI(lifespan=lifespan, default_response_class=ORJSONResponse)
 
 # Add CORS middleware
 app.add_middleware(
@@ -149,12 +276,17 @@ async def get_telegram_client():
 
 
 # Update your subscribe endpoint
-@app.post("/telegram/subscribe", response_model=AuthResponse)
+@app.post(
+    "/telegram/subscribe",
+    response_model=AuthResponse,
+    openapi_extra=json_body_schema(ChannelSubscription),
+)
 async def subscribe_to_channel(
-    subscription: ChannelSubscription,
+    request: Request,
     client: TelegramAuthManager = Depends(get_telegram_client),
 ):
     """Subscribe to a Telegram channel"""
+    subscription = await parse_body(request, ChannelSubscription)
     try:
         if not telegram_monitor:
             raise HTTPException(
@@ -190,17 +322,41 @@ async def get_messages(
                 status_code=500, detail="Telegram monitor not initialized"
             )
 
-        messages = await telegram_monitor.get_recent_messages(hours)
-        return MessageResponse(messages=messages)
+        # The serialized body is cached as-is, so hits skip validation too
+        cache_key = messages_cache_key(hours)
+        body = await FastAPICache.get_backend().get(cache_key)
+        if body is not None:
+            return Response(body, media_type="application/json")
+
+        # Stream rows as BigQuery pages arrive instead of building the list
+        messages = (
+            _MSG_ADAPTER.dump_json(_MSG_ADAPTER.validate_python(row))
+            async for row in telegram_monitor.iter_recent_messages(hours)
+        )
+        # Run the query and validate the first row before the 200 is sent, so
+        # those failures are still reported as a 500
+        first = await anext(messages, None)
+        return StreamingResponse(
+            cache_stream(
+                stream_json_array(prepend_item(first, messages), "messages"),
+                cache_key,
+            ),
+            media_type="application/json",
+        )
 
     except Exception as e:
         logger.error(f"Error retrieving messages: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@app.post("/telegram/auth", response_model=AuthResponse)
-async def authenticate_telegram(auth_data: TelegramAuth):
+@app.post(
+    "/telegram/auth",
+    response_model=AuthResponse,
+    openapi_extra=json_body_schema(TelegramAuth),
+)
+async def authenticate_telegram(request: Request):
     """Handle Telegram authentication"""
+    auth_data = await parse_body(request, TelegramAuth)
     if not telegram_manager:
         raise HTTPException(status_code=500, detail="Telegram client not initialized")
 
@@ -220,6 +376,10 @@ async def authenticate_telegram(auth_data: TelegramAuth):
             if not success and "not authorized" in message:
                 success, message = await telegram_manager.login(phone=auth_data.phone)
 
+        try:
+            await FastAPICache.clear(namespace=STATUS_CACHE_NAMESPACE)
+        except Exception as e:
+            logger.warning(f"Failed to clear status cache: {e}")
         return AuthResponse(success=success, message=message)
 
     except Exception as e:
@@ -228,10 +388,11 @@ async def authenticate_telegram(auth_data: TelegramAuth):
 
 
 @app.get("/telegram/status")
+@cache(expire=30, namespace=STATUS_CACHE_NAMESPACE, key_builder=status_key_builder)
 async def get_status(client: TelegramAuthManager = Depends(get_telegram_client)):
     """Get Telegram client status"""
     try:
-        is_authorized = await client.client.is_user_authorized()
+        is_authorized = await client.is_authorized()
         return {
             "status": "authorized" if is_authorized else "unauthorized",
             "session_file_exists": client.session_file.exists(),
@@ -4,10 +4,14 @@ from telethon import errors
 import os
 from typing import Optional, Tuple
 import logging
+import time
 from pathlib import Path
 
 logger = logging.getLogger(__name__)
 
+# Seconds before is_authorized() re-checks authorization with Telegram
+AUTH_CHECK_TTL = 60
+
 
 class TelegramAuthManager:
     def __init__(self, session_dir: str = ".sessions"):
@@ -29,6 +33,33 @@ class TelegramAuthManager:
         self.client: Optional[TelegramClient] = None
         self.session_file = self.session_dir / "telegram.session"
 
+        # Authorization state, cached to avoid an RPC per request
+        self._authorized = False
+        self._authorized_checked_at = 0.0
+
+    def _set_authorized(self, authorized: bool):
+        """Record the authorization state and when it was last known."""
+        self._authorized = authorized
+        self._authorized_checked_at = time.monotonic()
+
+    async def is_authorized(self) -> bool:
+        """
+        Check whether the user is authorized.
+
+        Returns the cached state, re-checking with Telegram once it is older
+        than AUTH_CHECK_TTL seconds.
+
+        Returns:
+            bool: Authorization status
+        """
+        if not self.client:
+            return False
+
+        if time.monotonic() - self._authorized_checked_at >= AUTH_CHECK_TTL:
+            self._set_authorized(await self.client.is_user_authorized())
+
+        return self._authorized
+
     async def initialize_client(self) -> Tuple[bool, str]:
         """
         Initialize the Telegram client with stored or provided credentials.
@@ -51,7 +82,8 @@ class TelegramAuthManager:
             # Try to start and check authorization
             await self.client.start()
 
-            if not await self.client.is_user_authorized():
+            self._set_authorized(await self.client.is_user_authorized())
+            if not self._authorized:
                 return False, "User not authorized. Please call login() method."
 
             return True, "Client initialized successfully"
@@ -92,6 +124,7 @@ class TelegramAuthManager:
 
             # Sign in with the code
             await self.client.sign_in(phone, code)
+            self._set_authorized(True)
 
             return True, "Login successful"
 
@@ -105,6 +138,7 @@ class TelegramAuthManager:
                     "Two-factor authentication enabled. Please enter your password: "
                 )
                 await self.client.sign_in(password=password)
+                self._set_authorized(True)
                 return True, "2FA login successful"
             except Exception as e:
                 return False, f"2FA login failed: {str(e)}"
@@ -127,14 +161,11 @@ class TelegramAuthManager:
             if not self.client:
                 return False, "Client not initialized"
 
-            if not await self.client.is_user_authorized():
+            if not self._authorized:
                 return False, "User not authorized"
 
             # Handle different channel format inputs
-            if channel.startswith("https://t.me/"):
-                channel = channel.split("/")[-1]
-            elif channel.startswith("@"):
-                channel = channel[1:]
+            channel = channel.removeprefix("https://t.me/").removeprefix("@")
 
             # Try to join the channel
             await self.client(JoinChannelRequest(channel))
@@ -151,3 +182,4 @@ class TelegramAuthManager:
         if self.client:
             await self.client.disconnect()
             self.client = None
+            self._set_authorized(False)
@@ -1,16 +1,267 @@
-from google.cloud import bigquery, storage
-from google.api_core import retry
-from telethon import TelegramClient, events
-from telethon.tl.types import Message, Channel
-from datetime import datetime, timedelta
+from google.cloud import bigquery, bigquery_storage_v1, storage
+from google.cloud.bigquery_storage_v1 import types as bq_storage_types
+from google.api_core import exceptions, retry
+from google.protobuf import descriptor_pb2, descriptor_pool, message_factory
+import google.auth
+from google.auth.transport.requests import AuthorizedSession
+from requests.adapters import HTTPAdapter
+from telethon import TelegramClient, events, utils
+from telethon.tl.functions.messages import GetHistoryRequest
+from telethon.tl.types import Message, MessageEmpty, Channel
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from hashlib import md5
 import asyncio
-from typing import List, Dict, Any, Optional, NamedTuple
-import json
+import io
+import itertools
+import string
+import tempfile
+import time
+import uuid
+from typing import (
+    List,
+    Dict,
+    Any,
+    Optional,
+    NamedTuple,
+    Iterator,
+    AsyncIterator,
+    Callable,
+    Awaitable,
+)
 import logging
-import os
-from hashlib import md5
+import httpx
+import orjson
 from openai import AsyncOpenAI
 
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+# Configure output once, however many monitors are created
+if not logger.handlers:
+    _handler = logging.StreamHandler()
+    _handler.setFormatter(
+        logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+    )
+    logger.addHandler(_handler)
+
+# Keep-alive connections shared by the Cloud Storage and BigQuery clients
+_HTTP_POOL_SIZE = 32
+
+# Seconds a resolved channel entity is reused before asking Telegram again
+_ENTITY_CACHE_TTL = 3600
+
+# Payload cap per insert request, below BigQuery's 10 MB request limit
+_MAX_REQUEST_BYTES = 9 * 1024 * 1024
+
+# Rows (and edits) kept for the next flush after a failed write; older ones
+# beyond this are dropped
+_MAX_RETAINED_ROWS = 10_000
+
+# Analysis results remembered per distinct message text, for repeated forwards
+_ANALYSIS_CACHE_SIZE = 4096
+
+# Chat completion calls allowed in flight at once per analyzer
+_ANALYSIS_CONCURRENCY = 10
+
+# Connection pool for OpenAI requests. HTTP/2 multiplexes concurrent analysis
+# calls over a few long-lived TLS connections.
+_OPENAI_LIMITS = httpx.Limits(
+    max_keepalive_connections=50, max_connections=200, keepalive_expiry=60
+)
+_OPENAI_TIMEOUT = httpx.Timeout(15.0, connect=5.0)
+
+# Rows fetched per BigQuery result page when streaming query results
+_RESULT_PAGE_SIZE = 1000
+
+# Media larger than this, or of unknown size, is spooled to a temporary file
+# instead of memory
+_MAX_IN_MEMORY_MEDIA_BYTES = 256 * 1024 * 1024
+
+# Resumable upload chunk size for media sent to Cloud Storage
+_UPLOAD_CHUNK_SIZE = 8 * 1024 * 1024
+
+# Seconds allowed per Cloud Storage upload request
+_UPLOAD_TIMEOUT = 60
+
+# Message columns returned to API callers, matching the API message model
+_API_MESSAGE_COLUMNS = (
+    "message_id",
+    "channel_name",
+    "date",
+    "text",
+    "views",
+    "forwards",
+    "has_media",
+    "media_type",
+    "media_urls",
+    "initial_scores",
+    "requires_investigation",
+)
+
+# Storage Write API failures that are retried through insert_rows_json
+_TRANSIENT_WRITE_ERRORS = (
+    exceptions.Aborted,
+    exceptions.DeadlineExceeded,
+    exceptions.InternalServerError,
+    exceptions.ResourceExhausted,
+    exceptions.ServiceUnavailable,
+)
+
+# Columns applied by the batched edit MERGE and their query parameter types
+_EDIT_FIELDS = (
+    ("message_id", "INT64"),
+    ("channel_id", "INT64"),
+    ("date", "TIMESTAMP"),
+    ("text", "STRING"),
+    ("views", "INT64"),
+    ("forwards", "INT64"),
+    ("replies", "INT64"),
+    ("edited", "BOOL"),
+    ("edited_at", "TIMESTAMP"),
+    ("has_reactions", "BOOL"),
+    ("reaction_counts", "STRING"),
+    ("initial_scores", "STRING"),
+    ("requires_investigation", "BOOL"),
+)
+
+# Edit MERGE join columns
+_EDIT_KEYS = ("channel_id", "message_id", "date")
+
+# Edit batches at least this large are loaded into a staging table and merged
+# from there, keeping large payloads out of the query request
+_EDIT_STAGING_MIN_ROWS = 500
+
+_EDIT_STAGING_SCHEMA = [
+    bigquery.SchemaField(name, type_) for name, type_ in _EDIT_FIELDS
+]
+
+# Each flush stages into its own table, which is deleted after the MERGE and
+# otherwise expires after this long
+_EDIT_STAGING_TTL = timedelta(hours=1)
+
+# Protobuf encoding of BigQuery column types for the Storage Write API.
+# TIMESTAMP columns are sent as microseconds since the epoch.
+_PROTO_FIELD_TYPES = {
+    "INTEGER": descriptor_pb2.FieldDescriptorProto.TYPE_INT64,
+    "STRING": descriptor_pb2.FieldDescriptorProto.TYPE_STRING,
+    "BOOLEAN": descriptor_pb2.FieldDescriptorProto.TYPE_BOOL,
+    "TIMESTAMP": descriptor_pb2.FieldDescriptorProto.TYPE_INT64,
+}
+
+
+def _proto_descriptor_for(
+    schema: List[bigquery.SchemaField],
+) -> descriptor_pb2.DescriptorProto:
+    """Build a self-contained proto2 message descriptor for a table schema."""
+    descriptor = descriptor_pb2.DescriptorProto(name="ChannelMessage")
+    for number, field in enumerate(schema, start=1):
+        descriptor.field.add(
+            name=field.name,
+            number=number,
+            type=_PROTO_FIELD_TYPES[field.field_type],
+            label=(
+                descriptor_pb2.FieldDescriptorProto.LABEL_REPEATED
+                if field.mode == "REPEATED"
+                else descriptor_pb2.FieldDescriptorProto.LABEL_OPTIONAL
+            ),
+        )
+    return descriptor
+
+
+def _proto_class_for(descriptor: descriptor_pb2.DescriptorProto):
+    """Create the protobuf message class described by ``descriptor``."""
+    file_proto = descriptor_pb2.FileDescriptorProto(
+        name=f"{descriptor.name.lower()}.proto", syntax="proto2"
+    )
+    file_proto.message_type.add().CopyFrom(descriptor)
+    pool = descriptor_pool.DescriptorPool()
+    pool.Add(file_proto)
+    return message_factory.GetMessageClass(
+        pool.FindMessageTypeByName(descriptor.name)
+    )
+
+
+def _timestamp_micros(value: Any) -> int:
+    """Convert an ISO string, datetime or epoch seconds to epoch microseconds."""
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    if isinstance(value, datetime):
+        # insert_rows_json reads naive timestamps as UTC; match that here
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        value = value.timestamp()
+    return int(value * 1_000_000)
+
+
+def _is_transient(error: Exception) -> bool:
+    """Whether a failed write is worth retrying on a later flush."""
+    return (
+        retry.if_transient_error(error)
+        or isinstance(error, (exceptions.RetryError, *_TRANSIENT_WRITE_ERRORS))
+    )
+
+
+def _query_param_value(type_: str, value: Any) -> Any:
+    """Adapt a row value for a query parameter of BigQuery type ``type_``."""
+    # Rows carry timestamps as epoch seconds, which parameters do not accept
+    if type_ == "TIMESTAMP" and isinstance(value, (int, float)):
+        return datetime.fromtimestamp(value, timezone.utc)
+    return value
+
+
+# channel_messages table schema, with media handling
+_CHANNEL_MESSAGES_SCHEMA = [
+    bigquery.SchemaField("message_id", "INTEGER"),
+    bigquery.SchemaField("channel_id", "INTEGER"),
+    bigquery.SchemaField("channel_name", "STRING"),
+    bigquery.SchemaField("date", "TIMESTAMP"),
+    bigquery.SchemaField("text", "STRING"),
+    bigquery.SchemaField("views", "INTEGER"),
+    bigquery.SchemaField("forwards", "INTEGER"),
+    bigquery.SchemaField("replies", "INTEGER"),
+    bigquery.SchemaField("has_media", "BOOLEAN"),
+    bigquery.SchemaField("media_type", "STRING"),
+    bigquery.SchemaField("media_urls", "STRING", mode="REPEATED"),
+    bigquery.SchemaField("processed", "BOOLEAN"),
+    bigquery.SchemaField("created_at", "TIMESTAMP"),
+    bigquery.SchemaField("edited", "BOOLEAN"),
+    bigquery.SchemaField("edited_at", "TIMESTAMP"),
+    bigquery.SchemaField("is_pinned", "BOOLEAN"),
+    bigquery.SchemaField("has_reactions", "BOOLEAN"),
+    bigquery.SchemaField("reaction_counts", "STRING"),  # JSON string of reaction counts
+    bigquery.SchemaField("initial_scores", "STRING"),  # Store JSON string of scores
+    bigquery.SchemaField("requires_investigation", "BOOLEAN"),
+]
+
+# Row encoding for the Storage Write API, built once per process
+_CHANNEL_MESSAGES_PROTO_DESCRIPTOR = _proto_descriptor_for(_CHANNEL_MESSAGES_SCHEMA)
+_CHANNEL_MESSAGES_PROTO_CLASS = _proto_class_for(_CHANNEL_MESSAGES_PROTO_DESCRIPTOR)
+_TIMESTAMP_FIELDS = frozenset(
+    field.name for field in _CHANNEL_MESSAGES_SCHEMA if field.field_type == "TIMESTAMP"
+)
+
+
+def _ndjson(rows: List[Dict[str, Any]]) -> io.BytesIO:
+    """Encode rows as a newline-delimited JSON file for a BigQuery load job."""
+    return io.BytesIO(b"\n".join(map(orjson.dumps, rows)))
+
+
+def _chunks(
+    rows: List[Dict[str, Any]], size: int, max_bytes: int = _MAX_REQUEST_BYTES
+) -> Iterator[List[Dict[str, Any]]]:
+    """Yield consecutive runs of at most ``size`` rows and ~``max_bytes`` of JSON."""
+    chunk: List[Dict[str, Any]] = []
+    chunk_bytes = 0
+    for row in rows:
+        row_bytes = len(orjson.dumps(row))
+        if chunk and (len(chunk) >= size or chunk_bytes + row_bytes > max_bytes):
+            yield chunk
+            chunk, chunk_bytes = [], 0
+        chunk.append(row)
+        chunk_bytes += row_bytes
+    if chunk:
+        yield chunk
+
 
 class AnalysisResult(NamedTuple):
     scores: Dict[str, float]
@@ -19,7 +270,12 @@ class AnalysisResult(NamedTuple):
 
 class InitialAnalyzer:
     def __init__(self, api_key: str):
-        self.client = AsyncOpenAI(api_key=api_key)
+        self.client = AsyncOpenAI(
+            api_key=api_key,
+            http_client=httpx.AsyncClient(
+                limits=_OPENAI_LIMITS, timeout=_OPENAI_TIMEOUT, http2=True
+            ),
+        )
 
         self.analysis_prompt = """Analyze the following message for toxicity and veracity.
 Provide scores between 0.0 and 1.0 where:
@@ -39,94 +295,207 @@ Additional Context:
 Respond in JSON format with only these fields:
 {{"toxicity": float, "veracity": float, "risk_level": float, "reasoning": string}}"""
 
-    async def analyze(self, message_data: dict) -> AnalysisResult:
+        # Split the template once into literal text and field names so each
+        # prompt is a plain join instead of a str.format parse. Escaped braces
+        # come back as extra field-less entries, so literals are merged until
+        # each field has exactly one literal before it; _prompt_parts always
+        # holds one more entry than _prompt_keys.
+        parts = [""]
+        keys = []
+        for literal, field, spec, conversion in string.Formatter().parse(
+            self.analysis_prompt
+        ):
+            parts[-1] += literal
+            if field is None:
+                continue
+            if not field.isidentifier() or spec or conversion:
+                raise ValueError(
+                    f"Unsupported analysis prompt field: {{{field}}}; only plain "
+                    "named fields are supported"
+                )
+            keys.append(field)
+            parts.append("")
+        self._prompt_parts: tuple[str, ...] = tuple(parts)
+        self._prompt_keys: tuple[str, ...] = tuple(keys)
+
+        # Recent results keyed by the MD5 of the analyzed text, oldest first
+        self._results: OrderedDict[str, AnalysisResult] = OrderedDict()
+        # Bounds concurrent chat completion calls across all callers
+        self._slots = asyncio.Semaphore(_ANALYSIS_CONCURRENCY)
+
+    def _render_prompt(self, values: Dict[str, Any]) -> str:
+        """Fill the analysis prompt template with ``values``."""
+        filled = [str(values[key]) for key in self._prompt_keys]
+        return "".join(
+            itertools.chain(
+                itertools.chain.from_iterable(zip(self._prompt_parts, filled)),
+                (self._prompt_parts[-1],),
+            )
+        )
+
+    @staticmethod
+    def _fallback_result() -> AnalysisResult:
+        """Safe default scores used whenever analysis fails."""
+        return AnalysisResult(
+            scores={"toxicity": 0.0, "veracity": 0.0, "risk_level": 0.0},
+            requires_investigation=False,
+        )
+
+    async def close(self):
+        """Close the pooled OpenAI connections."""
+        await self.client.close()
+
+    @staticmethod
+    def _text_key(message_data: dict) -> Optional[str]:
+        """Cache key for a message's text, or None if it has no text."""
+        # Telethon text is always a str or None
+        text = (message_data.get("text") or "").strip()
+        if not text:
+            return None
+        return md5(text.encode(), usedforsecurity=False).hexdigest()
+
+    def _remember(self, key: str, result: AnalysisResult):
+        """Cache a successful analysis, evicting the least recently used."""
+        self._results[key] = result
+        self._results.move_to_end(key)
+        if len(self._results) > _ANALYSIS_CACHE_SIZE:
+            self._results.popitem(last=False)
+
+    def _build_request(self, message_data: dict) -> Dict[str, Any]:
+        """Build the chat completion request body for one message."""
+        # Ensure all values are properly formatted
+        formatted_data = {
+            "text": (message_data.get("text") or "").strip() or "No text content",
+            "channel_name": str(message_data.get("channel_name", "unknown")),
+            "has_media": bool(message_data.get("has_media", False)),
+            "views": int(message_data.get("views", 0)),
+            "forwards": int(message_data.get("forwards", 0)),
+        }
+
+        # Format prompt with sanitized data
         try:
-            # Log input data
-            logging.info(f"Analyzing message data: {message_data}")
-
-            # Ensure all values are properly formatted
-            formatted_data = {
-                "text": str(message_data.get("text", "")).strip() or "No text content",
-                "channel_name": str(message_data.get("channel_name", "unknown")),
-                "has_media": bool(message_data.get("has_media", False)),
-                "views": int(message_data.get("views", 0)),
-                "forwards": int(message_data.get("forwards", 0)),
-            }
+            prompt = self._render_prompt(formatted_data)
+            logger.debug("Formatted prompt: %s", prompt)
+        except KeyError as e:
+            logger.error(f"Missing key in prompt formatting: {e}")
+            raise
+        except Exception as e:
+            logger.error(f"Error formatting prompt: {e}")
+            raise
 
-            # Format prompt with sanitized data
-            try:
-                prompt = self.analysis_prompt.format(**formatted_data)
-                logging.info(f"Formatted prompt: {prompt}")
-            except KeyError as e:
-                logging.error(f"Missing key in prompt formatting: {e}")
-                raise
-            except Exception as e:
-                logging.error(f"Error formatting prompt: {e}")
-                raise
+        return {
+            "model": "gpt-3.5-turbo",
+            "response_format": {"type": "json_object"},
+            "messages": [
+                {
+                    "role": "system",
+                    "content": "You are an expert content analyzer. Respond only with the requested JSON format.",
+                },
+                {"role": "user", "content": prompt},
+            ],
+            "temperature": 0.1,  # Low temperature for more consistent scoring
+        }
 
-            # Prepare message context
+    def _parse_content(self, content: str) -> AnalysisResult:
+        """
+        Turn the model's JSON reply into bounded analysis scores.
 
-            # Call OpenAI API with JSON mode
-            response = await self.client.chat.completions.create(
-                model="gpt-3.5-turbo",
-                response_format={"type": "json_object"},
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are an expert content analyzer. Respond only with the requested JSON format.",
-                    },
-                    {"role": "user", "content": prompt},
-                ],
-                temperature=0.1,  # Low temperature for more consistent scoring
-            )
-            print(f"Response: {response}")
+        Raises if the reply is not usable; callers fall back to safe default
+        scores, which are not cached.
+        """
+        # Clean the response string
+        content = content.strip()
+        content = content.encode().decode("utf-8-sig")
+        logger.debug("Cleaned content: %r", content)
 
-            # Add detailed logging of the API response
-            logging.info(f"Raw API response object: {response}")
-            logging.info(f"Response choices: {response.choices}")
+        try:
+            result = orjson.loads(content)
+        except orjson.JSONDecodeError as e:
+            logger.error(f"JSON decode error: {str(e)}")
+            logger.error(f"Failed content: {repr(content)}")
+            raise
 
-            content = response.choices[0].message.content
-            logging.info(f"Raw content before cleaning: {repr(content)}")
+        # Validate scores are within bounds
+        scores = {
+            k: max(0.0, min(1.0, float(v)))
+            for k, v in result.items()
+            if k in ["toxicity", "veracity", "risk_level"]
+        }
 
-            # Clean the response string
-            content = content.strip()
-            content = content.encode().decode("utf-8-sig")
-            logging.info(f"Cleaned content: {repr(content)}")
+        # Log reasoning if provided
+        if "reasoning" in result:
+            logger.info(f"Analysis reasoning: {result['reasoning']}")
 
-            try:
-                result = json.loads(content)
-            except json.JSONDecodeError as e:
-                logging.error(f"JSON decode error: {str(e)}")
-                logging.error(f"Failed content: {repr(content)}")
-                # Fallback to safe default scores instead of raising
-                return AnalysisResult(
-                    scores={"toxicity": 0.0, "veracity": 0.0, "risk_level": 0.0},
-                    requires_investigation=False,
-                )
+        return AnalysisResult(
+            scores=scores,
+            requires_investigation=(scores["risk_level"] + scores["toxicity"] > 1),
+        )
 
-            # Validate scores are within bounds
-            scores = {
-                k: max(0.0, min(1.0, float(v)))
-                for k, v in result.items()
-                if k in ["toxicity", "veracity", "risk_level"]
-            }
+    async def analyze(self, message_data: dict) -> AnalysisResult:
+        # Media-only messages have nothing to score
+        key = self._text_key(message_data)
+        if key is None:
+            return self._fallback_result()
 
-            # Log reasoning if provided
-            if "reasoning" in result:
-                logging.info(f"Analysis reasoning: {result['reasoning']}")
+        # Forwards repeat the same text across messages and channels
+        cached = self._results.get(key)
+        if cached is not None:
+            self._results.move_to_end(key)
+            return cached
 
-            return AnalysisResult(
-                scores=scores,
-                requires_investigation=(scores["risk_level"] + scores["toxicity"] > 1),
-            )
+        try:
+            # Log input data
+            logger.debug("Analyzing message data: %s", message_data)
+
+            # Call OpenAI API with JSON mode
+            async with self._slots:
+                response = await self.client.chat.completions.create(
+                    **self._build_request(message_data)
+                )
+
+            content = response.choices[0].message.content
+            logger.debug("API response: %s, raw content: %r", response, content)
+
+            result = self._parse_content(content)
+            self._remember(key, result)
+            return result
 
         except Exception as e:
-            logging.error(f"Error in content analysis: {e} {e.__traceback__} {prompt}")
+            logger.error(f"Error in content analysis: {e} {e.__traceback__}")
             # Fallback to safe default scores
-            return AnalysisResult(
-                scores={"toxicity": 0.0, "veracity": 0.0, "risk_level": 0.0},
-                requires_investigation=False,
-            )
+            return self._fallback_result()
+
+    async def analyze_many(self, messages: List[dict]) -> List[AnalysisResult]:
+        """
+        Analyze several messages, returning results in input order.
+
+        Messages without text or with a cached result are answered directly.
+        The rest are analyzed with concurrent per-message calls.
+        """
+        results: List[Optional[AnalysisResult]] = []
+        pending: Dict[str, List[int]] = {}
+        for index, message_data in enumerate(messages):
+            key = self._text_key(message_data)
+            if key is None:
+                results.append(self._fallback_result())
+            elif key in self._results:
+                self._results.move_to_end(key)
+                results.append(self._results[key])
+            else:
+                # Identical texts in one set are analyzed once
+                results.append(None)
+                pending.setdefault(key, []).append(index)
+
+        if not pending:
+            return results
+
+        firsts = [messages[indexes[0]] for indexes in pending.values()]
+        analyzed = await asyncio.gather(*(self.analyze(m) for m in firsts))
+
+        for indexes, result in zip(pending.values(), analyzed):
+            for index in indexes:
+                results[index] = result
+        return results
 
 
 class TelegramMonitor:
@@ -137,6 +506,11 @@ class TelegramMonitor:
         openai_api_key: str,
         bucket_name: str = "telegram_monitor",
         media_folder: str = "media",
+        batch_enabled: bool = True,
+        batch_flush_interval: float = 3.0,
+        max_buffer_size: int = 500,
+        on_flush: Optional[Callable[[], Awaitable[None]]] = None,
+        use_storage_write_api: bool = True,
     ):
         """
         Initialize the Telegram monitor with BigQuery and Cloud Storage integration.
@@ -146,118 +520,228 @@ class TelegramMonitor:
             project_id: Google Cloud project ID
             openai_api_key: OpenAI API key
             bucket_name: Google Cloud Storage bucket for media files
-            media_folder: Local folder for temporary media storage
+            media_folder: Deprecated and ignored. Media is buffered in memory,
+                or in an anonymous temporary file when large or of unknown
+                size, so no media folder is used; accepted only so existing
+                callers keep working
+            batch_enabled: Buffer rows and stream them to BigQuery in batches
+            batch_flush_interval: Seconds between background buffer flushes
+            max_buffer_size: Buffered rows that trigger an immediate flush; also
+                the maximum number of rows sent per insert request
+            on_flush: Coroutine function awaited after buffered rows have been
+                written, e.g. to invalidate cached API responses
+            use_storage_write_api: Stream rows through the BigQuery Storage Write
+                API, falling back to insert_rows_json on transient failures
         """
         # Configure logging
-        self.logger = logging.getLogger(__name__)
-        self.logger.setLevel(logging.INFO)
-        handler = logging.StreamHandler()
-        handler.setFormatter(
-            logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
-        )
-        self.logger.addHandler(handler)
+        self.logger = logger
 
         self.logger.info(f"Initializing TelegramMonitor with project_id: {project_id}")
 
         # Initialize clients and settings
         self.client = client
-        self.bq_client = bigquery.Client(project=project_id)
-        self.storage_client = storage.Client(project=project_id)
+        # Share one pooled, authorized session so uploads and queries reuse
+        # TLS connections instead of opening a new one per request
+        credentials, _ = google.auth.default(
+            scopes=["https://www.googleapis.com/auth/cloud-platform"]
+        )
+        self._http = AuthorizedSession(credentials)
+        self._http.mount(
+            "https://",
+            HTTPAdapter(pool_connections=_HTTP_POOL_SIZE, pool_maxsize=_HTTP_POOL_SIZE),
+        )
+        self.bq_client = bigquery.Client(
+            project=project_id, credentials=credentials, _http=self._http
+        )
+        self.storage_client = storage.Client(
+            project=project_id, credentials=credentials, _http=self._http
+        )
         self.bucket = self.storage_client.bucket(bucket_name)
-        self.media_folder = media_folder
         self.dataset_name = "telegram_monitor"
         self.table_name = "channel_messages"
+        self.view_name = "edits_resolved"
+        # Prefix of the per-flush edit staging tables
+        self.edit_staging_table_prefix = "channel_message_edits_"
+
+        # Edits are folded into existing rows in one MERGE per flush, either
+        # from a query parameter or, for large batches, a staging table.
+        # Joining on date as well lets BigQuery prune partitions.
+        assignments = ", ".join(
+            f"{name} = s.{name}" for name, _ in _EDIT_FIELDS if name not in _EDIT_KEYS
+        )
+        self._merge_edits_template = f"""
+        MERGE `{self.dataset_name}.{self.table_name}` t
+        USING {{source}} s
+        ON {" AND ".join(f"t.{key} = s.{key}" for key in _EDIT_KEYS)}
+        WHEN MATCHED THEN UPDATE SET {assignments}
+        """
+        self._merge_edits_query = self._merge_edits_template.format(
+            source="UNNEST(@payload)"
+        )
 
-        # Create media folder if it doesn't exist
-        os.makedirs(media_folder, exist_ok=True)
+        # Storage Write API client appending to the table's default stream
+        self.use_storage_write_api = use_storage_write_api
+        self.write_client = (
+            bigquery_storage_v1.BigQueryWriteAsyncClient()
+            if use_storage_write_api
+            else None
+        )
+        self._write_stream = (
+            bigquery_storage_v1.BigQueryWriteAsyncClient.table_path(
+                project_id, self.dataset_name, self.table_name
+            )
+            + "/streams/_default"
+        )
+        # Routing header the backend needs to place the bidi stream, as set
+        # by the library's own AppendRowsStream
+        self._write_metadata = (
+            ("x-goog-request-params", f"write_stream={self._write_stream}"),
+        )
 
-        # Initialize BigQuery resources
-        self._ensure_bigquery_resources()
+        # BigQuery references are created once and reused for every request
+        self._dataset_ref = self.bq_client.dataset(self.dataset_name)
+        self._table_ref = self._dataset_ref.table(self.table_name)
+        self._view_ref = self._dataset_ref.table(self.view_name)
+        # Table metadata, fetched or created once with the other resources
+        self._table: Optional[bigquery.Table] = None
+
+        # BigQuery resources are checked lazily, once, on first use
+        self._resources_ready = asyncio.Event()
+        self._resources_lock = asyncio.Lock()
+
+        # Subscribed channels keyed by their marked peer id (event.chat_id).
+        # One handler per event type routes updates for every channel.
+        self._channels: Dict[int, Channel] = {}
+        # Stored channel_name per channel id, fixed at subscribe time
+        self._channel_names: Dict[int, str] = {}
+        self.client.add_event_handler(self._on_new_message, events.NewMessage())
+        self.client.add_event_handler(
+            self._on_message_edited, events.MessageEdited()
+        )
 
-        self.handlers = []  # Add this to store handlers
+        # Resolved channel entities keyed by username, with resolve time
+        self._entity_cache: Dict[str, tuple[Channel, float]] = {}
+        # Subscription attempts in progress, keyed by username
+        self._inflight: Dict[str, asyncio.Task] = {}
         self.initial_analyzer = InitialAnalyzer(api_key=openai_api_key)
 
-    def _ensure_bigquery_resources(self):
-        """Create BigQuery dataset and table if they don't exist."""
+        # Buffered BigQuery inserts
+        self.batch_enabled = batch_enabled
+        self.batch_flush_interval = batch_flush_interval
+        self.max_buffer_size = max_buffer_size
+        self.on_flush = on_flush
+        self._buffer: List[Dict[str, Any]] = []
+        self._edit_buffer: List[Dict[str, Any]] = []
+        self._buffer_lock = asyncio.Lock()
+        self._flush_event = asyncio.Event()
+        # Set by close(); the flusher finishes its current flush and exits
+        self._closing = False
+        self._flush_task: Optional[asyncio.Task] = None
+        if self.batch_enabled:
+            self._flush_task = asyncio.create_task(self._flush_loop())
+
+    async def ensure_bigquery_resources(self):
+        """
+        Create BigQuery dataset, table and view if they don't exist.
+
+        The check runs once per monitor; later calls return immediately.
+        """
+        if self._resources_ready.is_set():
+            return
+
+        async with self._resources_lock:
+            if self._resources_ready.is_set():
+                return
+            await self._create_bigquery_resources()
+            self._resources_ready.set()
+
+    async def _create_bigquery_resources(self):
+        """Look up each BigQuery resource and create the missing ones."""
         self.logger.debug("Ensuring BigQuery resources exist")
-        dataset_ref = self.bq_client.dataset(self.dataset_name)
 
         # Create dataset if it doesn't exist
         try:
-            self.bq_client.get_dataset(dataset_ref)
+            await asyncio.to_thread(self.bq_client.get_dataset, self._dataset_ref)
         except Exception:
             self.logger.info(f"Creating dataset {self.dataset_name}")
-            dataset = bigquery.Dataset(dataset_ref)
+            dataset = bigquery.Dataset(self._dataset_ref)
             dataset.location = "US"
-            self.bq_client.create_dataset(dataset)
-
-        # Enhanced schema with media handling
-        schema = [
-            bigquery.SchemaField("message_id", "INTEGER"),
-            bigquery.SchemaField("channel_id", "INTEGER"),
-            bigquery.SchemaField("channel_name", "STRING"),
-            bigquery.SchemaField("date", "TIMESTAMP"),
-            bigquery.SchemaField("text", "STRING"),
-            bigquery.SchemaField("views", "INTEGER"),
-            bigquery.SchemaField("forwards", "INTEGER"),
-            bigquery.SchemaField("replies", "INTEGER"),
-            bigquery.SchemaField("has_media", "BOOLEAN"),
-            bigquery.SchemaField("media_type", "STRING"),
-            bigquery.SchemaField("media_urls", "STRING", mode="REPEATED"),
-            bigquery.SchemaField("processed", "BOOLEAN"),
-            bigquery.SchemaField("created_at", "TIMESTAMP"),
-            bigquery.SchemaField("edited", "BOOLEAN"),
-            bigquery.SchemaField("edited_at", "TIMESTAMP"),
-            bigquery.SchemaField("is_pinned", "BOOLEAN"),
-            bigquery.SchemaField("has_reactions", "BOOLEAN"),
-            bigquery.SchemaField(
-                "reaction_counts", "STRING"
-            ),  # JSON string of reaction counts
-            bigquery.SchemaField(
-                "initial_scores", "STRING"
-            ),  # Store JSON string of scores
-            bigquery.SchemaField("requires_investigation", "BOOLEAN"),
-        ]
-
-        table_ref = dataset_ref.table(self.table_name)
+            await asyncio.to_thread(self.bq_client.create_dataset, dataset)
+
         try:
-            self.bq_client.get_table(table_ref)
+            self._table = await asyncio.to_thread(
+                self.bq_client.get_table, self._table_ref
+            )
         except Exception:
             self.logger.info(f"Creating table {self.table_name}")
-            table = bigquery.Table(table_ref, schema=schema)
-            self.bq_client.create_table(table)
+            table = bigquery.Table(self._table_ref, schema=_CHANNEL_MESSAGES_SCHEMA)
+            # Partition by message date and cluster by channel so time-window
+            # and per-channel queries only scan the data they need
+            table.time_partitioning = bigquery.TimePartitioning(
+                type_=bigquery.TimePartitioningType.DAY, field="date"
+            )
+            table.clustering_fields = ["channel_id", "message_id"]
+            self._table = await asyncio.to_thread(self.bq_client.create_table, table)
+
+        # Edits that could not be merged, and repeated backfills, add extra
+        # rows per message; this view keeps the latest version of each
+        try:
+            await asyncio.to_thread(self.bq_client.get_table, self._view_ref)
+        except Exception:
+            self.logger.info(f"Creating view {self.view_name}")
+            view = bigquery.Table(self._view_ref)
+            view.view_query = f"""
+            SELECT *
+            FROM `{self.bq_client.project}.{self.dataset_name}.{self.table_name}`
+            WHERE TRUE
+            QUALIFY ROW_NUMBER() OVER (
+                PARTITION BY channel_id, message_id
+                ORDER BY COALESCE(edited_at, date) DESC, created_at DESC
+            ) = 1
+            """
+            await asyncio.to_thread(self.bq_client.create_table, view)
 
     async def subscribe_to_channel(self, channel_username: str) -> tuple[bool, str]:
         """
         Subscribe to a Telegram channel and start monitoring messages.
+
+        Concurrent calls for the same channel share a single subscription
+        attempt and all receive its result.
         """
         self.logger.info(f"Attempting to subscribe to channel: {channel_username}")
+
+        # Clean up channel username
+        channel_username = channel_username.removeprefix("https://t.me/").removeprefix(
+            "@"
+        )
+
+        task = self._inflight.get(channel_username)
+        if task is None:
+            task = asyncio.create_task(self._do_subscribe(channel_username))
+            self._inflight[channel_username] = task
+            task.add_done_callback(
+                lambda _: self._inflight.pop(channel_username, None)
+            )
+
+        # Shield so a cancelled caller does not cancel the shared attempt
+        return await asyncio.shield(task)
+
+    async def _do_subscribe(self, channel_username: str) -> tuple[bool, str]:
+        """Resolve a channel, attach message handlers and load recent history."""
         try:
-            # Clean up channel username
-            if channel_username.startswith("https://t.me/"):
-                channel_username = channel_username.split("/")[-1]
-            elif channel_username.startswith("@"):
-                channel_username = channel_username[1:]
-
-            # Get channel entity
-            channel = await self.client.get_entity(channel_username)
+            # Get channel entity, reusing a recent resolution when possible
+            cached = self._entity_cache.get(channel_username)
+            if cached and time.monotonic() - cached[1] < _ENTITY_CACHE_TTL:
+                channel = cached[0]
+            else:
+                channel = await self.client.get_entity(channel_username)
+                self._entity_cache[channel_username] = (channel, time.monotonic())
             if not isinstance(channel, Channel):
                 return False, "Not a valid channel"
 
-            # Start monitoring new messages
-            @self.client.on(events.NewMessage(chats=[channel]))
-            async def handle_new_message(event):
-                message = event.message
-                await self._process_message(message, channel)
-
-            # Monitor message edits
-            # @self.client.on(events.MessageEdited(chats=[channel]))
-            # async def handle_edited_message(event):
-            #     message = event.message
-            #     await self._handle_edited_message(message, channel)
-
-            # Store the handlers to prevent garbage collection
-            self.handlers.extend([handle_new_message])
+            # Start routing new messages and edits for this channel
+            self._channel_names[channel.id] = channel.username or str(channel.id)
+            self._channels[utils.get_peer_id(channel)] = channel
 
             # Load recent messages (last hour)
             await self._load_recent_messages(channel)
@@ -268,26 +752,69 @@ class TelegramMonitor:
             self.logger.error(f"Error subscribing to channel {channel_username}: {e}")
             return False, str(e)
 
+    async def _on_new_message(self, event):
+        """Dispatch a new message to processing if its channel is subscribed."""
+        channel = self._channels.get(event.chat_id)
+        if channel:
+            await self._process_message(event.message, channel)
+
+    async def _on_message_edited(self, event):
+        """Dispatch an edited message if its channel is subscribed."""
+        channel = self._channels.get(event.chat_id)
+        if channel:
+            await self._handle_edited_message(event.message, channel)
+
     async def _load_recent_messages(self, channel: Channel):
         """Load the 10 most recent messages with parallel processing."""
         self.logger.info(
-            f"Loading 10 most recent messages for channel {channel.username or channel.id}"
+            f"Loading 10 most recent messages for channel {self._channel_names[channel.id]}"
         )
 
         try:
             messages = []
-            message_tasks = []
 
-            # Just get the 10 most recent messages
-            async for message in self.client.iter_messages(channel, limit=10):
-                task = asyncio.create_task(self._prepare_message_data(message, channel))
-                message_tasks.append(task)
+            # Fetch the 10 most recent messages in a single RPC
+            history = await self.client(
+                GetHistoryRequest(
+                    peer=channel,
+                    limit=10,
+                    offset_date=None,
+                    offset_id=0,
+                    max_id=0,
+                    min_id=0,
+                    add_offset=0,
+                    hash=0,
+                )
+            )
 
-            # Process all messages at once since we're only handling 10
-            if message_tasks:
-                batch_results = await asyncio.gather(*message_tasks)
-                messages.extend(batch_results)
-                await self._store_messages(messages)
+            # Raw results are not bound to the client yet; do what
+            # iter_messages does so media downloads and .text work
+            entities = {
+                utils.get_peer_id(entity): entity
+                for entity in itertools.chain(history.users, history.chats)
+            }
+            history_messages = [
+                message
+                for message in history.messages
+                if not isinstance(message, MessageEmpty)
+            ]
+            for message in history_messages:
+                message._finish_init(self.client, entities, channel)
+
+            # Prepare all rows at once, then analyze them together so repeated
+            # texts are sent once
+            if history_messages:
+                rows = await asyncio.gather(
+                    *(
+                        self._prepare_message_row(message, channel)
+                        for message in history_messages
+                    )
+                )
+                results = await self.initial_analyzer.analyze_many(rows)
+                for data, analysis_result in zip(rows, results):
+                    self._attach_analysis(data, analysis_result)
+                messages.extend(rows)
+                await self._bulk_load_messages(messages)
 
             self.logger.info(f"Successfully loaded {len(messages)} recent messages")
 
@@ -295,6 +822,22 @@ class TelegramMonitor:
             self.logger.error(f"Error loading messages: {e}")
             raise
 
+    @staticmethod
+    def _media_blob_path(message: Message) -> str:
+        """Cloud Storage path of a message's media, derived from the message."""
+        # The blob path is already per chat, where message IDs are unique;
+        # the hex timestamp keeps the old id_suffix naming without hashing
+        base_filename = f"{message.id}_{int(message.date.timestamp()):x}"
+
+        if message.file and message.file.ext:
+            base_filename += message.file.ext
+
+        return f"channel_{message.chat_id}/{base_filename}"
+
+    def _media_url(self, blob_path: str) -> str:
+        """Public URL of an uploaded media blob."""
+        return f"https://storage.googleapis.com/{self.bucket.name}/{blob_path}"
+
     async def _handle_media(self, message: Message) -> List[str]:
         """
         Download and upload media to Cloud Storage, return media URLs.
@@ -304,158 +847,403 @@ class TelegramMonitor:
 
         media_urls = []
         try:
-            # Generate unique filename using message ID and MD5 hash
-            base_filename = (
-                f"{message.id}_{md5(str(message.date).encode()).hexdigest()[:8]}"
-            )
-
-            # Download media
-            path = await message.download_media(
-                file=f"{self.media_folder}/{base_filename}"
-            )
-
-            if path:
-                # Upload to Cloud Storage
-                blob_path = f"channel_{message.chat_id}/{base_filename}"
-                blob = self.bucket.blob(blob_path)
-                blob.upload_from_filename(path)
-
-                # Get the public URL without trying to modify ACLs
-                media_urls.append(
-                    f"https://storage.googleapis.com/{self.bucket.name}/{blob_path}"
+            blob_path = self._media_blob_path(message)
+
+            # Download small media into memory; large files go to disk
+            file_size = message.file.size if message.file else None
+            if file_size is not None and file_size <= _MAX_IN_MEMORY_MEDIA_BYTES:
+                buffer = io.BytesIO()
+            else:
+                buffer = tempfile.TemporaryFile()
+
+            with buffer:
+                if not await message.download_media(file=buffer):
+                    return media_urls
+                size = buffer.tell()
+                buffer.seek(0)
+
+                # Upload to Cloud Storage. Media up to one chunk goes in a single
+                # multipart request; larger files use chunked resumable uploads
+                blob = self.bucket.blob(
+                    blob_path,
+                    chunk_size=_UPLOAD_CHUNK_SIZE if size > _UPLOAD_CHUNK_SIZE else None,
+                )
+                await asyncio.to_thread(
+                    blob.upload_from_file,
+                    buffer,
+                    size=size,
+                    content_type=message.file.mime_type if message.file else None,
+                    timeout=_UPLOAD_TIMEOUT,
+                    checksum=None,
                 )
 
-                # Clean up local file
-                os.remove(path)
+                # Get the public URL without trying to modify ACLs
+                media_urls.append(self._media_url(blob_path))
 
         except Exception as e:
             self.logger.error(f"Error handling media for message {message.id}: {e}")
 
         return media_urls
 
-    async def _prepare_message_data(
-        self, message: Message, channel: Channel
+    async def _edited_media_urls(self, message: Message) -> List[str]:
+        """
+        Return media URLs for an edited message, uploading only if needed.
+
+        The blob from the original upload is reused when it exists and its
+        size matches the message's media; otherwise the media was never
+        uploaded or has been replaced, so it is uploaded again.
+        """
+        blob_path = self._media_blob_path(message)
+        try:
+            blob = await asyncio.to_thread(self.bucket.get_blob, blob_path)
+        except Exception as e:
+            self.logger.warning(f"Error checking media for message {message.id}: {e}")
+            blob = None
+
+        file_size = message.file.size if message.file else None
+        if blob is not None and (file_size is None or blob.size == file_size):
+            return [self._media_url(blob_path)]
+        return await self._handle_media(message)
+
+    @staticmethod
+    def _attach_analysis(data: Dict[str, Any], analysis_result: AnalysisResult):
+        """Store analysis results on a prepared message row."""
+        # Convert dict to JSON string
+        data["initial_scores"] = orjson.dumps(analysis_result.scores).decode()
+        data["requires_investigation"] = analysis_result.requires_investigation
+
+    async def _prepare_message_row(
+        self, message: Message, channel: Channel, upload_media: bool = True
     ) -> Dict[str, Any]:
-        """Prepare message data for storage with enhanced media handling."""
+        """
+        Prepare message data for storage with enhanced media handling.
+
+        With ``upload_media`` false, media already uploaded when the message
+        was first seen is reused instead of being transferred again.
+        """
+        # Telethon sets these attributes to None when absent; read each once
+        media = message.media
+        text = message.text or ""
+        views = message.views or 0
+        forwards = message.forwards or 0
+        replies = message.replies
+        replies_count = replies.replies if replies else 0
+        edit_date = message.edit_date
+
         media_type = None
         media_urls = []
 
-        if message.media:
-            media_type = type(message.media).__name__
-            media_urls = await self._handle_media(message)
+        if media:
+            media_type = type(media).__name__
+            if upload_media:
+                media_urls = await self._handle_media(message)
+            else:
+                media_urls = await self._edited_media_urls(message)
 
         # Handle reactions if available
         reactions = {}
-        if hasattr(message, "reactions") and message.reactions:
+        if message.reactions:
             for reaction in message.reactions.results:
                 reactions[reaction.reaction.emoticon] = reaction.count
 
-        # Get analysis results
-        analysis_result = await self.initial_analyzer.analyze(
-            {
-                "text": message.text,
-                "channel_name": channel.username or str(channel.id),
-                "has_media": bool(message.media),
-                "views": getattr(message, "views", 0),
-                "forwards": getattr(message, "forwards", 0),
-            }
-        )
-
-        # Handle replies safely
-        replies_count = 0
-        if hasattr(message, "replies"):
-            replies_count = (
-                message.replies.replies if hasattr(message.replies, "replies") else 0
-            )
-
         return {
             "message_id": message.id,
             "channel_id": channel.id,
-            "channel_name": channel.username or str(channel.id),
-            "date": message.date.isoformat(),
-            "text": message.text,
-            "views": getattr(message, "views", 0),
-            "forwards": getattr(message, "forwards", 0),
-            "replies": replies_count,  # Use the safely extracted count
-            "has_media": bool(message.media),
+            "channel_name": self._channel_names[channel.id],
+            # Timestamps are epoch seconds, which BigQuery reads directly
+            "date": message.date.timestamp(),
+            "text": text,
+            "views": views,
+            "forwards": forwards,
+            "replies": replies_count,
+            "has_media": bool(media),
             "media_type": media_type,
             "media_urls": media_urls,
             "processed": False,
-            "created_at": datetime.now().isoformat(),
-            "edited": message.edit_date is not None,
-            "edited_at": message.edit_date.isoformat() if message.edit_date else None,
+            "created_at": time.time(),
+            "edited": edit_date is not None,
+            "edited_at": edit_date.timestamp() if edit_date else None,
             "is_pinned": message.pinned,
             "has_reactions": bool(reactions),
-            "reaction_counts": json.dumps(reactions) if reactions else None,
-            "initial_scores": json.dumps(
-                analysis_result.scores
-            ),  # Convert dict to JSON string
-            "requires_investigation": analysis_result.requires_investigation,
+            "reaction_counts": orjson.dumps(reactions).decode() if reactions else None,
+            # Filled in by _attach_analysis
+            "initial_scores": None,
+            "requires_investigation": None,
         }
 
     async def _handle_edited_message(self, message: Message, channel: Channel):
-        """Handle edited messages by updating the database record."""
-        try:
-            data = await self._prepare_message_data(message, channel)
-
-            query = f"""
-            UPDATE `{self.dataset_name}.{self.table_name}`
-            SET 
-                text = @text,
-                views = @views,
-                forwards = @forwards,
-                replies = @replies,
-                edited = @edited,
-                edited_at = @edited_at,
-                has_reactions = @has_reactions,
-                reaction_counts = @reaction_counts
-            WHERE message_id = @message_id AND channel_id = @channel_id
-            """
+        """
+        Handle edited messages by queueing them for a batched MERGE.
 
-            job_config = bigquery.QueryJobConfig(
-                query_parameters=[
-                    bigquery.ScalarQueryParameter("text", "STRING", data["text"]),
-                    bigquery.ScalarQueryParameter("views", "INTEGER", data["views"]),
-                    bigquery.ScalarQueryParameter(
-                        "forwards", "INTEGER", data["forwards"]
-                    ),
-                    bigquery.ScalarQueryParameter(
-                        "replies", "INTEGER", data["replies"]
-                    ),
-                    bigquery.ScalarQueryParameter("edited", "BOOLEAN", data["edited"]),
-                    bigquery.ScalarQueryParameter(
-                        "edited_at", "TIMESTAMP", data["edited_at"]
-                    ),
-                    bigquery.ScalarQueryParameter(
-                        "has_reactions", "BOOLEAN", data["has_reactions"]
-                    ),
-                    bigquery.ScalarQueryParameter(
-                        "reaction_counts", "STRING", data["reaction_counts"]
-                    ),
-                    bigquery.ScalarQueryParameter(
-                        "message_id", "INTEGER", data["message_id"]
-                    ),
-                    bigquery.ScalarQueryParameter(
-                        "channel_id", "INTEGER", data["channel_id"]
-                    ),
-                ]
+        All edits buffered during a flush interval are applied with one MERGE
+        job instead of a DML UPDATE per edit. The edited text is re-analyzed,
+        but media is only uploaded again if it is missing or was replaced.
+        """
+        try:
+            data = await self._prepare_message_row(
+                message, channel, upload_media=False
             )
+            self._attach_analysis(data, await self.initial_analyzer.analyze(data))
+            data["edited"] = True
 
-            query_job = self.bq_client.query(query, job_config=job_config)
-            query_job.result()
+            if not self.batch_enabled:
+                await self._merge_edits([data])
+                return
+
+            async with self._buffer_lock:
+                self._edit_buffer.append(data)
 
         except Exception as e:
             self.logger.error(f"Error handling edited message: {e}")
 
-    @retry.Retry(predicate=retry.if_exception_type(Exception))
+    async def _merge_edits(self, edits: List[Dict[str, Any]]):
+        """
+        Apply edited messages to the table with as few MERGE jobs as possible.
+
+        Batches of at least _EDIT_STAGING_MIN_ROWS distinct messages are loaded
+        into a staging table and merged in one job; smaller ones are merged
+        from a query parameter. If a MERGE fails, e.g. because the target rows
+        are still in the legacy streaming buffer, its edits are appended as
+        new rows instead and the edits_resolved view picks the latest version.
+        """
+        # MERGE allows at most one source row per target row; keep the latest
+        latest = {}
+        for data in edits:
+            latest[(data["channel_id"], data["message_id"])] = data
+        rows = list(latest.values())
+
+        await self.ensure_bigquery_resources()
+
+        if len(rows) >= _EDIT_STAGING_MIN_ROWS:
+            try:
+                await self._merge_staged_edits(rows)
+            except Exception as e:
+                self.logger.warning(
+                    f"Merging staged edits failed, appending them instead: {e}"
+                )
+                for chunk in _chunks(rows, self.max_buffer_size):
+                    await self._store_messages(chunk)
+            return
+
+        for chunk in _chunks(rows, self.max_buffer_size):
+            payload = bigquery.ArrayQueryParameter(
+                "payload",
+                "STRUCT",
+                [
+                    bigquery.StructQueryParameter(
+                        None,
+                        *(
+                            bigquery.ScalarQueryParameter(
+                                name, type_, _query_param_value(type_, data[name])
+                            )
+                            for name, type_ in _EDIT_FIELDS
+                        ),
+                    )
+                    for data in chunk
+                ],
+            )
+            job_config = bigquery.QueryJobConfig(query_parameters=[payload])
+            try:
+                query_job = await asyncio.to_thread(
+                    self.bq_client.query, self._merge_edits_query, job_config=job_config
+                )
+                await asyncio.to_thread(query_job.result)
+            except Exception as e:
+                self.logger.warning(f"Merging edits failed, appending them instead: {e}")
+                await self._store_messages(chunk)
+
+    async def _merge_staged_edits(self, edits: List[Dict[str, Any]]):
+        """
+        Load ``edits`` into a new staging table and MERGE them from there.
+
+        The table is unique to this call, so concurrent flushes, including
+        ones from other processes, never see each other's rows. A load job is
+        used rather than streaming so the rows are visible to the MERGE as
+        soon as the job completes. Full message rows are encoded as they are;
+        columns outside the staging schema are dropped on load.
+        """
+        staging_ref = self._dataset_ref.table(
+            f"{self.edit_staging_table_prefix}{uuid.uuid4().hex}"
+        )
+        staging = bigquery.Table(staging_ref, schema=_EDIT_STAGING_SCHEMA)
+        # Cleaned up by BigQuery if this process dies before deleting it
+        staging.expires = datetime.now(timezone.utc) + _EDIT_STAGING_TTL
+
+        try:
+            await asyncio.to_thread(self.bq_client.create_table, staging)
+
+            job_config = bigquery.LoadJobConfig(
+                source_format=bigquery.SourceFormat.NEWLINE_DELIMITED_JSON,
+                schema=_EDIT_STAGING_SCHEMA,
+                ignore_unknown_values=True,
+                write_disposition=bigquery.WriteDisposition.WRITE_APPEND,
+            )
+            load_job = await asyncio.to_thread(
+                self.bq_client.load_table_from_file,
+                _ndjson(edits),
+                staging_ref,
+                job_config=job_config,
+            )
+            await asyncio.to_thread(load_job.result)
+
+            query = self._merge_edits_template.format(
+                source=f"`{self.dataset_name}.{staging_ref.table_id}`"
+            )
+            query_job = await asyncio.to_thread(self.bq_client.query, query)
+            await asyncio.to_thread(query_job.result)
+
+        finally:
+            try:
+                await asyncio.to_thread(
+                    self.bq_client.delete_table, staging_ref, not_found_ok=True
+                )
+            except Exception as e:
+                self.logger.warning(f"Could not delete staging table: {e}")
+
+    async def _enqueue_messages(self, messages: List[Dict[str, Any]]):
+        """Add messages to the insert buffer, waking the flusher once it is full."""
+        if not messages:
+            return
+
+        if not self.batch_enabled:
+            await self._store_messages(messages)
+            return
+
+        async with self._buffer_lock:
+            self._buffer.extend(messages)
+            if len(self._buffer) >= self.max_buffer_size:
+                # Wake the flusher rather than making this caller wait on it
+                self._flush_event.set()
+
+    async def _flush(self):
+        """Write all buffered messages to BigQuery in size-capped chunks."""
+        async with self._buffer_lock:
+            rows, self._buffer = self._buffer, []
+            edits, self._edit_buffer = self._edit_buffer, []
+
+        # A chunk that failed transiently is put back for the next flush
+        # instead of aborting the rest of this one. Chunks rejected outright,
+        # e.g. with row errors, would fail again and are dropped.
+        failed_rows = []
+        for chunk in _chunks(rows, self.max_buffer_size):
+            try:
+                await self._store_messages(chunk)
+            except Exception as e:
+                if _is_transient(e):
+                    self.logger.error(
+                        f"Error storing {len(chunk)} buffered messages, will retry: {e}"
+                    )
+                    failed_rows.extend(chunk)
+                else:
+                    self.logger.error(
+                        f"Dropping {len(chunk)} buffered messages rejected by BigQuery: {e}"
+                    )
+
+        # Edits go last so they can match rows written in this same flush.
+        # _merge_edits sees the whole buffer so it can decide whether to stage
+        # it, and chunks the rest itself.
+        failed_edits = []
+        if edits:
+            try:
+                await self._merge_edits(edits)
+            except Exception as e:
+                if _is_transient(e):
+                    self.logger.error(
+                        f"Error applying {len(edits)} buffered edits, will retry: {e}"
+                    )
+                    failed_edits = edits
+                else:
+                    self.logger.error(
+                        f"Dropping {len(edits)} buffered edits rejected by BigQuery: {e}"
+                    )
+
+        if failed_rows or failed_edits:
+            async with self._buffer_lock:
+                self._buffer = self._retain(failed_rows + self._buffer)
+                self._edit_buffer = self._retain(failed_edits + self._edit_buffer)
+
+        if len(failed_rows) + len(failed_edits) < len(rows) + len(edits):
+            await self._notify_flushed()
+
+    async def _notify_flushed(self):
+        """Await on_flush after a write; cache invalidation is best-effort."""
+        if not self.on_flush:
+            return
+        try:
+            await self.on_flush()
+        except Exception as e:
+            self.logger.warning(f"Cache invalidation after flush failed: {e}")
+
+    def _retain(self, rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Cap a buffer holding retried rows, dropping the oldest."""
+        if len(rows) <= _MAX_RETAINED_ROWS:
+            return rows
+        self.logger.error(
+            f"Dropping {len(rows) - _MAX_RETAINED_ROWS} buffered rows after repeated write failures"
+        )
+        return rows[-_MAX_RETAINED_ROWS:]
+
+    async def _flush_loop(self):
+        """Flush the buffer every interval, or sooner once it fills, until closed."""
+        while not self._closing:
+            try:
+                await asyncio.wait_for(
+                    self._flush_event.wait(), timeout=self.batch_flush_interval
+                )
+            except asyncio.TimeoutError:
+                pass
+            if self._closing:
+                # close() writes out whatever is left
+                break
+            self._flush_event.clear()
+            try:
+                await self._flush()
+            except Exception as e:
+                self.logger.error(f"Error flushing message buffer: {e}")
+
+    async def close(self):
+        """Detach event handlers, stop the flusher and write out buffered rows."""
+        self.client.remove_event_handler(self._on_new_message)
+        self.client.remove_event_handler(self._on_message_edited)
+
+        # Stop the flusher without cancelling it, so a flush in progress is
+        # not abandoned with its rows already taken out of the buffer
+        if self._flush_task:
+            self._closing = True
+            self._flush_event.set()
+            await self._flush_task
+            self._flush_task = None
+        try:
+            await self._flush()
+            if self._buffer or self._edit_buffer:
+                self.logger.error(
+                    f"Closing with {len(self._buffer)} messages and "
+                    f"{len(self._edit_buffer)} edits that could not be written"
+                )
+        finally:
+            await self.initial_analyzer.close()
+
+    @retry.AsyncRetry(predicate=retry.if_transient_error)
     async def _store_messages(self, messages: List[Dict[str, Any]]):
         """Store messages in BigQuery with enhanced retry logic."""
         if not messages:
             return
 
         try:
-            table_ref = self.bq_client.dataset(self.dataset_name).table(self.table_name)
-            errors = self.bq_client.insert_rows_json(table_ref, messages)
+            await self.ensure_bigquery_resources()
+
+            if self.use_storage_write_api:
+                try:
+                    await self._append_rows(messages)
+                    return
+                except _TRANSIENT_WRITE_ERRORS as e:
+                    self.logger.warning(
+                        f"Storage Write API append failed, falling back to insert_rows_json: {e}"
+                    )
+
+            errors = await asyncio.to_thread(
+                self.bq_client.insert_rows_json, self._table, messages
+            )
 
             if errors:
                 self.logger.error(f"Errors inserting rows: {errors}")
@@ -465,46 +1253,158 @@ class TelegramMonitor:
             self.logger.error(f"Error storing messages: {e}")
             raise
 
-    async def get_recent_messages(self, hours: int = 1) -> List[Dict[str, Any]]:
+    async def _bulk_load_messages(self, messages: List[Dict[str, Any]]):
         """
-        Retrieve recent messages from BigQuery.
+        Append messages to BigQuery with a load job instead of streaming.
+
+        Load jobs are cheaper for backfills and make rows immediately
+        available to DML, but tables are limited to 1,500 load jobs per day,
+        so the live message path keeps streaming through the buffer.
         """
+        if not messages:
+            return
+
+        try:
+            await self.ensure_bigquery_resources()
+
+            job_config = bigquery.LoadJobConfig(
+                source_format=bigquery.SourceFormat.NEWLINE_DELIMITED_JSON,
+                schema=_CHANNEL_MESSAGES_SCHEMA,
+                write_disposition=bigquery.WriteDisposition.WRITE_APPEND,
+            )
+            load_job = await asyncio.to_thread(
+                self.bq_client.load_table_from_file,
+                _ndjson(messages),
+                self._table_ref,
+                job_config=job_config,
+            )
+            await asyncio.to_thread(load_job.result)
+
+        except Exception as e:
+            self.logger.error(f"Error bulk loading messages: {e}")
+            raise
+
+        await self._notify_flushed()
+
+    def _to_proto_row(self, row: Dict[str, Any]) -> bytes:
+        """Serialize a message row with the table's protobuf descriptor."""
+        message = _CHANNEL_MESSAGES_PROTO_CLASS()
+        for name, value in row.items():
+            if value is None:
+                continue
+            if name in _TIMESTAMP_FIELDS:
+                value = _timestamp_micros(value)
+            if isinstance(value, list):
+                getattr(message, name).extend(value)
+            else:
+                setattr(message, name, value)
+        return message.SerializeToString()
+
+    async def _append_rows(self, messages: List[Dict[str, Any]]):
+        """Append rows to the table's default stream via the Storage Write API."""
+        proto_rows = bq_storage_types.ProtoRows(
+            serialized_rows=[self._to_proto_row(row) for row in messages]
+        )
+        request = bq_storage_types.AppendRowsRequest(
+            write_stream=self._write_stream,
+            proto_rows=bq_storage_types.AppendRowsRequest.ProtoData(
+                writer_schema=bq_storage_types.ProtoSchema(
+                    proto_descriptor=_CHANNEL_MESSAGES_PROTO_DESCRIPTOR
+                ),
+                rows=proto_rows,
+            ),
+        )
+
+        async def requests():
+            yield request
+
+        responses = await self.write_client.append_rows(
+            requests(), metadata=self._write_metadata
+        )
+        async for response in responses:
+            if response.error.code:
+                raise exceptions.from_grpc_status(
+                    response.error.code, response.error.message
+                )
+            if response.row_errors:
+                raise Exception(f"Failed to append rows: {list(response.row_errors)}")
+
+    async def _iter_query_rows(self, query: str) -> AsyncIterator[bigquery.Row]:
+        """Run a query and yield its rows, fetching each result page on a thread."""
+        await self.ensure_bigquery_resources()
+        query_job = await asyncio.to_thread(self.bq_client.query, query)
+        rows = await asyncio.to_thread(query_job.result, page_size=_RESULT_PAGE_SIZE)
+        pages = iter(rows.pages)
+        while (page := await asyncio.to_thread(next, pages, None)) is not None:
+            for row in page:
+                yield row
+
+    async def iter_recent_messages(
+        self, hours: int = 1
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Yield recent messages from BigQuery one result page at a time.
+
+        Pages are fetched on a worker thread, so only one page of rows is held
+        in memory at once.
+        """
+        # Filter the partitioned table before resolving edits: the window in
+        # the edits_resolved view would otherwise block partition pruning.
+        # Every version of a message shares its original date, so filtering
+        # first still yields the latest version.
         query = f"""
-        SELECT *
+        SELECT {", ".join(_API_MESSAGE_COLUMNS)}
         FROM `{self.dataset_name}.{self.table_name}`
         WHERE date >= TIMESTAMP_SUB(CURRENT_TIMESTAMP(), INTERVAL {hours} HOUR)
+        QUALIFY ROW_NUMBER() OVER (
+            PARTITION BY channel_id, message_id
+            ORDER BY COALESCE(edited_at, date) DESC, created_at DESC
+        ) = 1
         ORDER BY date DESC
         """
 
+        # Errors are re-raised so callers can tell a failed or truncated
+        # result from a complete one
         try:
-            query_job = self.bq_client.query(query)
-            rows = query_job.result()
-            return [dict(row) for row in rows]
+            async for row in self._iter_query_rows(query):
+                yield dict(row)
 
         except Exception as e:
             self.logger.error(f"Error retrieving messages: {e}")
+            raise
+
+    async def get_recent_messages(self, hours: int = 1) -> List[Dict[str, Any]]:
+        """
+        Retrieve recent messages from BigQuery.
+        """
+        try:
+            return [row async for row in self.iter_recent_messages(hours)]
+        except Exception:
             return []
 
-    async def get_last_messages(self, limit: int = 10) -> List[Dict[str, Any]]:
+    async def get_last_messages(
+        self, limit: int = 10, fields: tuple[str, ...] = _API_MESSAGE_COLUMNS
+    ) -> List[Dict[str, Any]]:
+        """
+        Retrieve the latest messages from BigQuery.
+
+        Only ``fields`` are selected and copied out of each row; by default
+        these are the columns exposed by the API message model.
+        """
         query = f"""
-        SELECT *,
-        JSON_EXTRACT_SCALAR(initial_scores, '$.toxicity') as toxicity_score,
-        JSON_EXTRACT_SCALAR(initial_scores, '$.veracity') as veracity_score,
-        JSON_EXTRACT_SCALAR(initial_scores, '$.risk_level') as risk_level
-        FROM `{self.dataset_name}.{self.table_name}`
+        SELECT {", ".join(fields)}
+        FROM `{self.dataset_name}.{self.view_name}`
         ORDER BY date DESC
         LIMIT {limit}
         """
 
         try:
-            query_job = self.bq_client.query(query)
-            rows = query_job.result()
             messages = []
-            for row in rows:
-                message = dict(row)
+            async for row in self._iter_query_rows(query):
+                message = {field: row[field] for field in fields}
                 # Parse scores if they exist
                 if message.get("initial_scores"):
-                    message["initial_scores"] = json.loads(message["initial_scores"])
+                    message["initial_scores"] = orjson.loads(message["initial_scores"])
                 messages.append(message)
             return messages
         except Exception as e:
@@ -515,16 +1415,15 @@ class TelegramMonitor:
         """Process a new message with initial analysis"""
         try:
             self.logger.info(
-                f"Processing new message {message.id} from channel {channel.username or channel.id}"
+                f"Processing new message {message.id} from channel {self._channel_names[channel.id]}"
             )
-            data = await self._prepare_message_data(message, channel)
+            data = await self._prepare_message_row(message, channel)
 
             # Add initial analysis
             analysis_result = await self.initial_analyzer.analyze(data)
-            data["initial_scores"] = analysis_result.scores
-            data["requires_investigation"] = analysis_result.requires_investigation
+            self._attach_analysis(data, analysis_result)
 
-            await self._store_messages([data])
+            await self._enqueue_messages([data])
 
             # Trigger investigation if needed
             if analysis_result.requires_investigation: